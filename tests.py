@@ -1,14 +1,20 @@
 from unittest import TestCase
 import unittest
+import gc
+import sys
+import weakref
 from textwrap import dedent
+from collections import ChainMap
 from dataclasses import dataclass
+from operator import attrgetter
+from types import MappingProxyType, MemberDescriptorType
 from typing import Callable, Any, Dict
 
 
-@dataclass
+@dataclass(frozen=True)
 class Field:
     """
-    Defines a field with a label and preconditions
+    Defines a field with a label and preconditions, equal fields are shared between records
     """
     label: str
     precondition: Callable[[Any], bool] = None
@@ -16,87 +22,272 @@ class Field:
 
 # Record and supporting classes here
 
-class RecordMeta(type):
+# Canonical instance of every field in use, keyed by label and precondition identity
+_interned_fields = weakref.WeakValueDictionary()
+
+
+def _intern_field(field):
     """
-    Metaclass for creating classes with aggregated fields and preconditions.
+    Return the canonical instance of an equal field, registering this one if there is none.
+    """
+    return _interned_fields.setdefault((field.label, id(field.precondition)), field)
+
+
+def _storage_name(class_name, field_name):
+    """
+    Build the interned private name a field is stored under, mangled like CPython mangles __slots__.
+    """
+    private_name = "_" + field_name
+    if private_name.startswith("__") and not private_name.endswith("__") and class_name.lstrip("_"):
+        private_name = f"_{class_name.lstrip('_')}{private_name}"
+    return sys.intern(private_name)
+
+
+def _linearize(bases):
+    """
+    Compute the MRO a class with these bases will get, without the class itself (C3 linearization).
+    """
+    sequences = [base.mro() for base in bases] + [list(bases)]
+    mro = []
+    while True:
+        sequences = [sequence for sequence in sequences if sequence]
+        if not sequences: return mro
+
+        # Take the first head that doesn't appear in the tail of another sequence
+        for sequence in sequences:
+            head = sequence[0]
+            if not any(head in other[1:] for other in sequences): break
+        else:
+            raise TypeError("Cannot create a consistent method resolution order (MRO)")
+        mro.append(head)
+        sequences = [sequence[1:] if sequence[0] is head else sequence for sequence in sequences]
+
+
+def _slot_names(slots):
     """
-    def __new__(cls, name, bases, attrs):
-        aggregate_fields = {}
+    Normalise a __slots__ declaration, a single string names a single slot.
+    """
+    return (slots,) if isinstance(slots, str) else tuple(slots)
+
+
+def _inherited_slot_names(bases):
+    """
+    Collect the slot names already declared somewhere in the bases' MROs.
+    """
+    names = set()
+    for base in bases:
+        for class_ in base.mro():
+            names.update(_slot_names(class_.__dict__.get('__slots__', ())))
+    return names
+
+
+def _has_layout_conflict(bases):
+    """
+    Check whether more than one base adds its own slotted fields, which CPython can't combine.
+    """
+    layout = object
+    for base in bases:
+        # The nearest class in the MRO declaring real slots determines the instance layout
+        solid = next((class_ for class_ in base.mro()
+                      if set(_slot_names(class_.__dict__.get('__slots__', ()))) - {'__weakref__', '__dict__'}),
+                     object)
+        if issubclass(layout, solid): continue
+        if not issubclass(solid, layout): return True
+        layout = solid
+    return False
+
+
+def _key_mismatch(required_keys, incoming_keys):
+    """
+    Build the TypeError for keyword arguments that don't match the record fields.
+    """
+    missing_keys = required_keys - incoming_keys
+    if missing_keys: return TypeError(f"Required keys are missing: {sorted(missing_keys)}")
+    return TypeError(f"Too many keys were provided: {sorted(incoming_keys - required_keys)}")
+
 
-        # Bottom up approach, prioritize fields in child
-        for base in bases[::-1]:
-            if hasattr(base, '_fields'):
-                aggregate_fields.update(base._fields)
+def _make_init(name, required_keys, validation_plan, private_names):
+    """
+    Generate a straight line __init__ specialised to a record's validation plan.
 
-        # Overwrite fields if necessary
-        aggregate_fields.update({key: value for key, value in attrs.items() if isinstance(value, Field)})
+    Subclasses reaching it through super().__init__ have a different plan, so those calls
+    fall back to the generic Record.__init__.
+    """
+    namespace = {'__name__': __name__, '_key_mismatch': _key_mismatch, '_required_keys': required_keys,
+                 '_validation_plan': validation_plan, '_generic_init': Record.__init__}
+    lines = ["def __init__(self, **kwargs):",
+             "    if type(self)._validation_plan is not _validation_plan: return _generic_init(self, **kwargs)",
+             "    if kwargs.keys() != _required_keys: raise _key_mismatch(_required_keys, kwargs.keys())"]
+    for i, (field_name, precondition, field_type) in enumerate(validation_plan):
+        lines.append(f"    value{i} = kwargs[{field_name!r}]")
+        if precondition is not None:
+            namespace[f'_precondition{i}'] = precondition
+            lines.append(f"    if not _precondition{i}(value{i}): "
+                         f"raise TypeError(\"Precondition for field '{field_name}' is violated\")")
+        namespace[f'_type{i}'] = field_type
+        lines.append(f"    if type(value{i}) is not _type{i} and not isinstance(value{i}, _type{i}): "
+                     f"raise TypeError('Field {field_name} type is incorrect.')")
+
+    # Only store once every field is valid, so a failed construction leaves no partial state
+    for i, (field_name, _, _) in enumerate(validation_plan):
+        lines.append(f"    self.{private_names[field_name]} = value{i}")
+    exec(compile("\n".join(lines), f"<generated {name}.__init__>", "exec"), namespace)
+    init = namespace['__init__']
+    init.__qualname__ = f"{name}.__init__"
+    init._generated = True
+    return init
 
-        # Add properties linked to field names during class creation with custom GET function
-        for field_name, field_value in aggregate_fields.items():
-            attrs[field_name] = property(
-                fget=lambda self, name=field_name: self.get_value(name)
-            )
 
-        # Set fields
-        attrs['_fields'] = aggregate_fields
-        return super().__new__(cls, name, bases, attrs)
+class RecordMeta(type):
+    """
+    Metaclass for creating classes with aggregated fields and preconditions.
+    """
+    def __new__(cls, name, bases, attrs, slots=True, **kwargs):
+        if _has_layout_conflict(bases):
+            raise TypeError(f"Record {name} has multiple bases storing fields in slots, "
+                            f"declare all but one of them with slots=False")
+
+        # Single pass over own and inherited fields in MRO order, so a field resolves to the
+        # same class an attribute lookup would, even under diamond inheritance
+        mro = _linearize(bases)
+        own_fields = {key: _intern_field(value) for key, value in attrs.items() if isinstance(value, Field)}
+        attrs['_declared_fields'] = MappingProxyType(own_fields)
+        declaring = [class_ for class_ in mro if '_declared_fields' in class_.__dict__]
+        aggregate_fields = dict(ChainMap(own_fields, *[class_._declared_fields for class_ in declaring]))
+
+        # Intern the private attribute names once so accesses don't rebuild them, inherited
+        # fields keep the name the declaring class stores them under
+        private_names = {}
+        for key in aggregate_fields:
+            if key in own_fields:
+                private_names[key] = _storage_name(name, key)
+            else:
+                private_names[key] = next(
+                    class_._private_names[key] for class_ in declaring if key in class_._declared_fields)
+        attrs['_private_names'] = private_names
+
+        # Add read only properties linked to the private field data during class creation
+        for field_name, private_name in private_names.items():
+            attrs[field_name] = property(attrgetter(private_name))
+
+        # Store private field data in slots, skipping any a base already provides, unless the
+        # class opts out so it can be combined with other slotted records
+        if slots:
+            inherited_slots = _inherited_slot_names(bases)
+            attrs['__slots__'] = _slot_names(attrs.get('__slots__', ())) + tuple(
+                private_name for private_name in private_names.values() if private_name not in inherited_slots)
+
+        # Merge annotations in MRO order, including non record bases, child annotations take priority
+        merged_annotations = dict(ChainMap(
+            attrs.get('__annotations__', {}), *[class_.__dict__.get('__annotations__', {}) for class_ in mro]))
+        attrs['_merged_annotations'] = merged_annotations
+
+        # A field's type comes from its annotation, so every field needs one
+        unannotated = [key for key in aggregate_fields if key not in merged_annotations]
+        if unannotated: raise TypeError(f"Fields of {name} are missing type annotations: {unannotated}")
+
+        # Precompute everything __init__ needs so construction skips the invariant work
+        attrs['_required_keys'] = frozenset(aggregate_fields)
+        attrs['_validation_plan'] = tuple(
+            (key, value.precondition, merged_annotations[key]) for key, value in aggregate_fields.items())
+
+        # Precompile the __str__ template, reading each value once straight from its private slot
+        # rather than through the property. Quotes are baked in for string annotations and left out
+        # for builtin types that can't hold a string (their instance layout can't be combined with
+        # str), any other annotation is checked per call
+        field_strs = []
+        str_checked = []
+        for field, (field_name, _, field_type) in zip(aggregate_fields.values(), attrs['_validation_plan']):
+            label = field.label.replace("{", "{{").replace("}", "}}")
+            private_name = private_names[field_name]
+            if isinstance(field_type, type) and issubclass(field_type, str):
+                value_str = f"'{{0.{private_name}}}'"
+            elif isinstance(field_type, type) and field_type.__module__ == 'builtins' \
+                    and not issubclass(str, field_type):
+                value_str = f"{{0.{private_name}}}"
+            else:
+                value_str = f"{{1[{field_name}]}}"
+                str_checked.append((field_name, private_name))
+            field_strs.append(f"  # {label}\n  {field_name}={value_str}\n")
+        attrs['_str_template'] = f"{name}(\n" + "\n".join(field_strs) + ")"
+        attrs['_str_checked'] = tuple(str_checked)
+
+        # Set fields, read only since the rest of the class is derived from them
+        attrs['_fields'] = MappingProxyType(aggregate_fields)
+        new_cls = super().__new__(cls, name, bases, attrs, **kwargs)
+
+        # Unroll the validation plan into a generated __init__, unless the class or a base
+        # between it and Record defines its own
+        inherited_init = new_cls.__init__
+        if '__init__' not in attrs and (inherited_init is Record.__init__
+                                        or getattr(inherited_init, '_generated', False)):
+            new_cls.__init__ = _make_init(name, attrs['_required_keys'], attrs['_validation_plan'], private_names)
+        return new_cls
 
 
 class Record(metaclass=RecordMeta):
     """
     Base class for records with fields and preconditions.
-    """
-    def __init__(self, **kwargs):
 
-        # Grab required fields + incoming keyword arguments
-        required_keys = set(self._fields.keys())
-        incoming_keys = set(kwargs.keys())
+    Field data is stored in __slots__. A record combining several bases that each add fields
+    needs all but one of those bases declared with slots=False, which stores their data in an
+    instance __dict__ instead.
+    """
+    __slots__ = ('__weakref__',)
 
-        # Key checks, too few + too many
-        if len(required_keys - incoming_keys) > 0: raise TypeError("Required keys are missing.")
-        if len(incoming_keys - required_keys) > 0: raise TypeError("Too many keys were provided.")
+    def __init__(self, **kwargs):
 
-        # Grab required annotations
-        required_annotations = {}
-        for class_ in type(self).mro():
-            if hasattr(class_, "__annotations__"):
-                required_annotations.update(class_.__annotations__)
+        # Key checks, too few + too many, only build the differences on failure
+        incoming_keys = kwargs.keys()
+        if incoming_keys != self._required_keys: raise _key_mismatch(self._required_keys, incoming_keys)
 
-        # Process incoming keyword arguments
-        for field_name, field_value in kwargs.items():
+        # Process incoming keyword arguments following the per class validation plan
+        for field_name, precondition, field_type in self._validation_plan:
+            field_value = kwargs[field_name]
 
             # Plug incoming data into precondition checks
-            precondition = getattr(self._fields.get(field_name), 'precondition', None)
-            if precondition and not precondition(field_value):
+            if precondition is not None and not precondition(field_value):
                 raise TypeError(f"Precondition for field '{field_name}' is violated")
 
-            # Type check on fields
-            if not isinstance(field_value, required_annotations.get(field_name)):
+            # Type check on fields, exact type matches skip the isinstance machinery
+            if type(field_value) is not field_type and not isinstance(field_value, field_type):
                 raise TypeError(f"Field {field_name} type is incorrect.")
 
-            # Set real field data as private
-            setattr(self, "_" + field_name, field_value)
+        # Set real field data as private once everything is valid, writing straight to the slots
+        for field_name, private_name in self._private_names.items():
+            object.__setattr__(self, private_name, kwargs[field_name])
 
-    # Custom get function for read only fields
+    # Custom get function for read only fields, getattr resolves the private slot directly
+    # and also covers records declared with slots=False
     def get_value(self, name):
-        return getattr(self, "_" + name)
+        return getattr(self, self._private_names[name])
 
     # String representation
     def __str__(self):
-        fields_str = "\n".join(
-            [f"  # {self._fields[key].label}\n  {key}='{getattr(self, key)}'\n" if isinstance(getattr(self, key), str)
-             else f"  # {self._fields[key].label}\n  {key}={getattr(self, key)}\n" for key in self._fields])
-        return f"{self.__class__.__name__}(\n{fields_str})"
+        checked = {}
+        for field_name, private_name in self._str_checked:
+            value = getattr(self, private_name)
+            checked[field_name] = f"'{value}'" if isinstance(value, str) else value
+        return self._str_template.format(self, checked)
 
 
 # Usage of Record
+
+# Shared preconditions, set membership is a hash lookup through a bound C method
+_HABITATS = frozenset(("air", "land", "water"))
+
+
+def _non_negative(x):
+    return 0 <= x
+
+
 class Person(Record):
     """
     A simple person record
     """
     name: str = Field(label="The name")
     age: int = Field(label="The person's age", precondition=lambda x: 0 <= x <= 150)
-    income: float = Field(label="The person's income", precondition=lambda x: 0 <= x)
+    income: float = Field(label="The person's income", precondition=_non_negative)
 
 
 class Named(Record):
@@ -110,8 +301,8 @@ class Animal(Named):
     """
     An animal
     """
-    habitat: str = Field(label="The habitat", precondition=lambda x: x in ["air", "land", "water"])
-    weight: float = Field(label="The animals weight (kg)", precondition=lambda x: 0 <= x)
+    habitat: str = Field(label="The habitat", precondition=_HABITATS.__contains__)
+    weight: float = Field(label="The animals weight (kg)", precondition=_non_negative)
 
 
 class Dog(Animal):
@@ -142,6 +333,12 @@ class RecordTests(TestCase):
         with self.assertRaises(AttributeError):
             james.age = 32
 
+    def test_private_slot(self):
+        james = Person(name="JAMES", age=34, income=24000.0)
+        self.assertIsInstance(Person.__dict__["_age"], MemberDescriptorType)
+        with self.assertRaises(AttributeError):
+            james._undeclared = 1
+
     def test_str(self):
         james = Person(name="JAMES", age=34, income=24000.0)
         correct = dedent("""
@@ -158,10 +355,217 @@ class RecordTests(TestCase):
         """).strip()
         self.assertEqual(str(james), correct)
 
+    def test_str_inherited(self):
+        mike = Dog(name="mike", habitat="land", weight=50., bark="ARF")
+        correct = dedent("""
+        Dog(
+          # The name
+          name='mike'
+
+          # The habitat
+          habitat='land'
+
+          # The animals weight (kg)
+          weight=50.0
+
+          # Sound of bark
+          bark='ARF'
+        )
+        """).strip()
+        self.assertEqual(str(mike), correct)
+
+    def test_generated_init(self):
+        self.assertIsNot(Person.__init__, Record.__init__)
+        self.assertEqual(Person.__init__.__qualname__, "Person.__init__")
+        self.assertEqual(Person.__init__.__module__, __name__)
+        self.assertEqual(Person.__init__.__code__.co_filename, "<generated Person.__init__>")
+        with self.assertRaises(TypeError):
+            Dog(name="mike", habitat="space", weight=50., bark="ARF")
+        with self.assertRaises(TypeError):
+            Dog(name="mike", habitat="land", weight=50., bark=1)
+
+    def test_fields_read_only(self):
+        self.assertEqual(list(Dog._fields), ["name", "habitat", "weight", "bark"])
+        with self.assertRaises(TypeError):
+            Dog._fields["owner"] = Field(label="The owner")
+
+    def test_fields_interned(self):
+        self.assertIs(Person._fields["name"], Named._fields["name"])
+        self.assertIsNot(Person._fields["age"], Person._fields["income"])
+
+    def test_weakref(self):
+        james = Person(name="JAMES", age=34, income=24000.0)
+        self.assertIs(weakref.ref(james)(), james)
+
+    def test_string_slots(self):
+        class Tagged(Named):
+            __slots__ = '_extra'
+            tag: str = Field(label="The tag")
+
+        self.assertEqual(Tagged.__slots__, ('_extra', '_tag'))
+
+    def test_multiple_slotted_bases(self):
+        class Owned(Named):
+            owner: str = Field(label="The owner")
+
+        with self.assertRaises(TypeError):
+            class Pet(Dog, Owned):
+                pass
+
+        class Adoptable(Named, slots=False):
+            owner: str = Field(label="The owner")
+
+        class Pet(Dog, Adoptable):
+            pass
+
+        rex = Pet(name="rex", habitat="land", weight=20., bark="WOOF", owner="james")
+        self.assertEqual((rex.name, rex.bark, rex.owner), ("rex", "WOOF", "james"))
+
+    def test_custom_init_super(self):
+        class Tagged(Dog):
+            tag: str = Field(label="The tag")
+
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+
+        rex = Tagged(name="rex", habitat="land", weight=20., bark="WOOF", tag="good")
+        self.assertEqual((rex.bark, rex.tag), ("WOOF", "good"))
+        with self.assertRaises(TypeError):
+            Tagged(name="rex", habitat="land", weight=20., bark="WOOF", tag=1)
+
+    def test_inherited_custom_init(self):
+        calls = []
+
+        class Base(Named):
+            def __init__(self, **kwargs):
+                calls.append(type(self).__name__)
+                super().__init__(**kwargs)
+
+        class Child(Base):
+            tag: str = Field(label="The tag")
+
+        child = Child(name="rex", tag="good")
+        self.assertEqual(calls, ["Child"])
+        self.assertEqual(child.tag, "good")
+
+    def test_interned_fields_collected(self):
+        class Temporary(Record):
+            value: int = Field(label="A temporary value")
+
+        key = ("A temporary value", id(None))
+        self.assertIn(key, _interned_fields)
+        del Temporary
+        gc.collect()
+        self.assertNotIn(key, _interned_fields)
+
+    def test_unhashable_precondition(self):
+        class Unhashable:
+            def __eq__(self, other):
+                return self is other
+
+            def __call__(self, x):
+                return 0 <= x
+
+        class Counter(Record):
+            count: int = Field(label="The count", precondition=Unhashable())
+
+        self.assertEqual(Counter(count=1).count, 1)
+        with self.assertRaises(TypeError):
+            Counter(count=-1)
+
+    def test_plain_base_annotations(self):
+        class Typed:
+            value: int
+
+        class Valued(Record, Typed):
+            value = Field(label="The value")
+
+        self.assertEqual(Valued(value=1).value, 1)
+        with self.assertRaises(TypeError):
+            Valued(value="1")
+
+    def test_unannotated_field(self):
+        with self.assertRaises(TypeError):
+            class Untyped(Record):
+                value = Field(label="The value")
+
+    def test_no_partial_state(self):
+        for cls in (Person, Record):
+            james = object.__new__(Person)
+            with self.assertRaises(TypeError):
+                cls.__init__(james, name="JAMES", age=160, income=24000.0)
+            self.assertFalse(hasattr(james, "_name"))
+
+    def test_underscore_field(self):
+        class Secret(Record):
+            _hidden: int = Field(label="hidden")
+
+        secret = Secret(_hidden=1)
+        self.assertEqual(secret._hidden, 1)
+        self.assertEqual(Secret._private_names["_hidden"], "_Secret__hidden")
+        self.assertEqual(str(secret), "Secret(\n  # hidden\n  _hidden=1\n)")
+
+        class MoreSecret(Secret):
+            pass
+
+        self.assertEqual(MoreSecret(_hidden=2)._hidden, 2)
+
+    def test_str_loose_annotations(self):
+        class Loose(Record):
+            anything: object = Field(label="Anything")
+            either: int | str = Field(label="Either")
+
+        self.assertEqual(Loose._str_checked, (("anything", "_anything"), ("either", "_either")))
+        self.assertEqual(str(Loose(anything="x", either="y")), dedent("""
+        Loose(
+          # Anything
+          anything='x'
+
+          # Either
+          either='y'
+        )
+        """).strip())
+        self.assertEqual(str(Loose(anything=1, either=2)), dedent("""
+        Loose(
+          # Anything
+          anything=1
+
+          # Either
+          either=2
+        )
+        """).strip())
+        self.assertEqual(Person._str_checked, ())
+
+    def test_diamond(self):
+        class Base(Record):
+            x: int = Field(label="x")
+
+        class Left(Base):
+            pass
+
+        class Right(Base):
+            x: str = Field(label="x as text")
+
+        class Diamond(Left, Right):
+            pass
+
+        self.assertEqual(_linearize((Left, Right)), Diamond.mro()[1:])
+        self.assertEqual(Diamond._fields["x"].label, "x as text")
+        self.assertEqual(Diamond(x="one").x, "one")
+        with self.assertRaises(TypeError):
+            Diamond(x=1)
+
     def test_dog(self):
         mike = Dog(name="mike", habitat="land", weight=50., bark="ARF")
         self.assertEqual(mike.weight, 50)
 
+    def test_slots(self):
+        mike = Dog(name="mike", habitat="land", weight=50., bark="ARF")
+        self.assertFalse(hasattr(mike, '__dict__'))
+        self.assertEqual(Dog.__slots__, ('_bark',))
+        with self.assertRaises(AttributeError):
+            mike.owner = "james"
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file